@@ -4,22 +4,49 @@ Provides REST API endpoints and CLI interface for course completion prediction,
 dropout detection, and learning insights.
 """
 
+import asyncio
 import click
-import json
+import contextlib
+import io
 import joblib
+import orjson
+import os
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any
 from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import numpy as np
 from .preprocess import LearnerDataProcessor
 from .predict import LearningPredictor
 
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:  # pragma: no cover - optional acceleration
+    _CSV_ENGINE = 'c'
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Hold a strong reference to the batcher task: the event loop keeps
+    # only a weak one, and a collected task would strand every queued
+    # future. Cancel it on shutdown and restore the fallback path.
+    global _inflight, _batcher_task
+    _inflight = asyncio.Queue()
+    _batcher_task = asyncio.create_task(_micro_batcher())
+    yield
+    _batcher_task.cancel()
+    _batcher_task = None
+    _inflight = None
+
 app = FastAPI(
     title="Learning Intelligence Tool",
     description="AI-powered predictions and insights for educational platforms",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan
 )
 
 class StudentPrediction(BaseModel):
@@ -34,29 +61,92 @@ class PredictionResponse(BaseModel):
     predictions: List[Dict[str, Any]]
     insights: Dict[str, Any]
 
-# Initialize predictors
+# Initialize predictor and processor once; both are stateless across
+# requests so a single shared instance serves every call.
 predictor = LearningPredictor()
+processor = LearnerDataProcessor()
+
+# Micro-batching for /predict-single: concurrent requests queue their
+# feature vectors and a background task scores them in one predict_proba
+# call, amortizing sklearn dispatch overhead across the batch.
+_MICRO_BATCH_MAX = 64
+_MICRO_BATCH_WINDOW_S = 0.005
+_inflight: asyncio.Queue = None
+_batcher_task: asyncio.Task = None
+
+async def _micro_batcher():
+    """Drain queued single predictions and score them in one batch."""
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await _inflight.get()]
+        deadline = loop.time() + _MICRO_BATCH_WINDOW_S
+        while len(items) < _MICRO_BATCH_MAX:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(_inflight.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        X = np.vstack([x for x, _ in items])
+        try:
+            probs = await run_in_threadpool(
+                lambda: predictor.completion_model.predict_proba(X)[:, 1].tolist()
+            )
+        except Exception as e:
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            continue
+        for (_, fut), prob in zip(items, probs):
+            if not fut.done():
+                fut.set_result(prob)
 
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": "1.0.0"}
 
+def _predict_batch_sync(contents: bytes) -> Dict[str, Any]:
+    """CPU-bound batch pipeline, run off the event loop."""
+    # Feed the raw bytes straight to the parser; decoding to a Python
+    # str first would double the upload's memory footprint. pyarrow's
+    # multithreaded reader is used when available, else pandas' C engine.
+    df = pd.read_csv(io.BytesIO(contents), engine=_CSV_ENGINE)
+    processed_data, features = processor.process(df)
+    predictions = predictor.predict(processed_data, features)
+    insights = predictor.generate_insights(df, predictions)
+    return {
+        "status": "success",
+        "predictions": predictions,
+        "insights": insights
+    }
+
+def _predict_single_sync(student: StudentPrediction) -> Dict[str, Any]:
+    """CPU-bound single-student pipeline, run off the event loop.
+
+    The Pydantic model has already validated the fields, and the model only
+    consumes the three raw features, so the pandas pipeline is skipped.
+    """
+    prediction = predictor.predict_one(
+        time_spent_min=student.time_spent_min,
+        score_percent=student.score_percent,
+        chapter_order=student.chapter_order,
+        student_id=student.student_id,
+    )
+    return {
+        "status": "success",
+        "prediction": prediction
+    }
+
 @app.post("/predict")
 async def predict_batch(file: UploadFile = File(...)):
     """Batch prediction from CSV file."""
     try:
         contents = await file.read()
-        df = pd.read_csv(__import__('io').StringIO(contents.decode()))
-        processor = LearnerDataProcessor()
-        processed_data, features = processor.process(df)
-        predictions = predictor.predict(processed_data, features)
-        insights = predictor.generate_insights(df, predictions)
-        return {
-            "status": "success",
-            "predictions": predictions,
-            "insights": insights
-        }
+        # CSV parsing and inference hold the GIL-bound CPU for the whole
+        # batch; run them in the threadpool so the event loop stays free.
+        return await run_in_threadpool(_predict_batch_sync, contents)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -64,14 +154,20 @@ async def predict_batch(file: UploadFile = File(...)):
 async def predict_single(student: StudentPrediction):
     """Predict for single student."""
     try:
-        data_dict = student.dict()
-        df = pd.DataFrame([data_dict])
-        processor = LearnerDataProcessor()
-        processed_data, features = processor.process(df)
-        predictions = predictor.predict(processed_data, features)
+        if _inflight is None:
+            # Batcher not running (e.g. app used outside the server);
+            # score directly in the threadpool.
+            return await run_in_threadpool(_predict_single_sync, student)
+        x = np.array(
+            [student.time_spent_min, student.score_percent, student.chapter_order],
+            dtype=np.float32
+        )
+        fut = asyncio.get_running_loop().create_future()
+        await _inflight.put((x, fut))
+        prob = await fut
         return {
             "status": "success",
-            "prediction": predictions[0] if predictions else None
+            "prediction": predictor.result_from_prob(prob, student.student_id)
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -96,7 +192,6 @@ def predict_cli(input, output):
     """Run predictions via CLI."""
     try:
         df = pd.read_csv(input)
-        processor = LearnerDataProcessor()
         processed_data, features = processor.process(df)
         predictions = predictor.predict(processed_data, features)
         insights = predictor.generate_insights(df, predictions)
@@ -107,14 +202,42 @@ def predict_cli(input, output):
             "insights": insights
         }
         
+        serialized = orjson.dumps(result, option=orjson.OPT_INDENT_2)
         if output:
-            with open(output, 'w') as f:
-                json.dump(result, f, indent=2)
+            with open(output, 'wb') as f:
+                f.write(serialized)
             click.echo(f"Results saved to {output}")
         else:
-            click.echo(json.dumps(result, indent=2))
+            click.echo(serialized.decode())
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
 
+@cli.command()
+@click.option('--host', default='0.0.0.0', help='Bind address')
+@click.option('--port', default=8000, type=int, help='Bind port')
+@click.option('--workers', default=None, type=int, help='Worker processes (defaults to CPU count)')
+def serve(host, port, workers):
+    """Serve the API with uvloop and one worker per core.
+
+    Inference is CPU-bound, so one worker per core lets concurrent
+    requests scale across cores; uvloop and httptools cut the per-request
+    event-loop and HTTP-parsing overhead versus the asyncio defaults.
+    """
+    import uvicorn
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers or os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
+    )
+
+@cli.command()
+def build_models():
+    """Serialize the trained models to app/models/ for fast startup."""
+    predictor.save_models()
+    click.echo("Models saved to app/models/")
+
 if __name__ == "__main__":
     cli()
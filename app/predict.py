@@ -3,21 +3,67 @@
 Handles model inference, risk detection, and insight generation.
 """
 
+import joblib
+import os
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import List, Dict, Any
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
+
+MODEL_DIR = Path(__file__).resolve().parent / 'models'
+COMPLETION_MODEL_PATH = MODEL_DIR / 'completion_rf.pkl'
+DROPOUT_MODEL_PATH = MODEL_DIR / 'dropout_rf.pkl'
 
 class LearningPredictor:
     """Handles ML predictions for course completion and dropout detection."""
     
     def __init__(self):
-        """Initialize predictor with dummy models."""
-        self.completion_model = self._create_dummy_model()
-        self.dropout_model = self._create_dummy_model()
-        self.scaler = StandardScaler()
-    
+        """Initialize predictor from saved model artifacts.
+
+        Falls back to fitting the dummy models in-process when no artifact
+        exists (fresh checkout before `build-models` has been run).
+        """
+        self.completion_model = self._load_or_create(COMPLETION_MODEL_PATH)
+        self.dropout_model = self._load_or_create(DROPOUT_MODEL_PATH)
+
+    def _load_or_create(self, path: Path):
+        """Load a serialized model, or fit the dummy one if absent.
+
+        mmap_mode='r' maps the tree arrays read-only from the file, so
+        multiple worker processes share one physical copy via the page
+        cache instead of each heap-allocating its own.
+        """
+        if path.exists():
+            try:
+                return joblib.load(path, mmap_mode='r')
+            except Exception:
+                # Corrupt, truncated, or version-incompatible artifact;
+                # a broken file must not make the module unimportable.
+                pass
+        return self._create_dummy_model()
+
+    def save_models(self):
+        """Serialize both models so later startups skip refitting.
+
+        Stored uncompressed: compressed archives can't be memory-mapped.
+        """
+        MODEL_DIR.mkdir(exist_ok=True)
+        self._dump_atomic(self.completion_model, COMPLETION_MODEL_PATH)
+        self._dump_atomic(self.dropout_model, DROPOUT_MODEL_PATH)
+
+    @staticmethod
+    def _dump_atomic(model, path: Path):
+        """Dump to a temp file and rename into place.
+
+        The live model's arrays may be memory-mapped from `path`; dumping
+        straight onto it would truncate the mapping mid-pickle (SIGBUS).
+        os.replace keeps the old inode intact for existing mappings.
+        """
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+
     def _create_dummy_model(self):
         """Create a simple trained model for demonstration."""
         model = RandomForestClassifier(n_estimators=10, random_state=42, max_depth=5)
@@ -27,50 +73,93 @@ class LearningPredictor:
         return model
     
     def predict(self, df: pd.DataFrame, features: List[str]) -> List[Dict[str, Any]]:
-        """Generate predictions for students."""
-        predictions = []
-        
-        # Handle missing chapter_order
-        if 'chapter_order' not in df.columns:
-            df['chapter_order'] = 1
-        
-        for idx, row in df.iterrows():
-            try:
-                X = np.array([[row['time_spent_min'], row['score_percent'], row.get('chapter_order', 1)]])
-                completion_prob = float(self.completion_model.predict_proba(X)[0][1])
-                
-                # Risk determination
-                if completion_prob < 0.3:
-                    risk_level = 'HIGH'
-                elif completion_prob < 0.6:
-                    risk_level = 'MEDIUM'
-                else:
-                    risk_level = 'LOW'
-                
-                predictions.append({
-                    'student_id': row.get('student_id', f'S{idx}'),
-                    'completion_probability': round(completion_prob, 3),
-                    'risk_level': risk_level,
-                    'predicted_completion': 1 if completion_prob >= 0.5 else 0
-                })
-            except Exception as e:
-                predictions.append({
-                    'student_id': row.get('student_id', f'S{idx}'),
-                    'error': str(e)
-                })
-        
-        return predictions
+        """Generate predictions for students.
+
+        Runs a single batched predict_proba over the whole frame instead of
+        scoring one row at a time, so per-row Python overhead stays constant
+        regardless of batch size.
+        """
+        # Extract the model features once; reindex fills a missing
+        # chapter_order with the default of 1 without mutating the input.
+        # float32 up front: sklearn's tree ensembles cast to float32
+        # internally anyway, so this avoids a copy and halves the bytes
+        # moved during tree traversal.
+        X = df.reindex(
+            columns=['time_spent_min', 'score_percent', 'chapter_order'],
+            fill_value=1
+        ).to_numpy(dtype=np.float32)
+
+        probs = self.completion_model.predict_proba(X)[:, 1]
+
+        # Risk determination
+        risk_levels = np.where(probs < 0.3, 'HIGH', np.where(probs < 0.6, 'MEDIUM', 'LOW'))
+        predicted = (probs >= 0.5).astype(np.int8)
+
+        if 'student_id' in df.columns:
+            student_ids = df['student_id'].tolist()
+        else:
+            student_ids = [f'S{i}' for i in range(len(df))]
+
+        # Unbox to native Python objects once, rather than converting one
+        # numpy scalar at a time inside the comprehension.
+        return [
+            {
+                'student_id': sid,
+                'completion_probability': prob,
+                'risk_level': risk,
+                'predicted_completion': pred
+            }
+            for sid, prob, risk, pred in zip(
+                student_ids,
+                np.round(probs, 3).tolist(),
+                risk_levels.tolist(),
+                predicted.tolist()
+            )
+        ]
     
+    def predict_one(self, time_spent_min: float, score_percent: float,
+                    chapter_order: int = 1, student_id: str = 'S0') -> Dict[str, Any]:
+        """Predict for a single student without any pandas round trip.
+
+        Latency-critical path for the single-student endpoint: one numpy
+        allocation and one predict_proba call.
+        """
+        X = np.array([[time_spent_min, score_percent, chapter_order]], dtype=np.float32)
+        completion_prob = float(self.completion_model.predict_proba(X)[0, 1])
+        return self.result_from_prob(completion_prob, student_id)
+
+    def result_from_prob(self, completion_prob: float, student_id: str = 'S0') -> Dict[str, Any]:
+        """Build a prediction dict from an already-computed probability."""
+        # Risk determination
+        if completion_prob < 0.3:
+            risk_level = 'HIGH'
+        elif completion_prob < 0.6:
+            risk_level = 'MEDIUM'
+        else:
+            risk_level = 'LOW'
+
+        return {
+            'student_id': student_id,
+            'completion_probability': round(completion_prob, 3),
+            'risk_level': risk_level,
+            'predicted_completion': 1 if completion_prob >= 0.5 else 0
+        }
+
     def generate_insights(self, df: pd.DataFrame, predictions: List[Dict]) -> Dict[str, Any]:
         """Generate actionable insights from predictions."""
-        high_risk = [p for p in predictions if p.get('risk_level') == 'HIGH']
-        
+        probs = np.fromiter(
+            (p['completion_probability'] for p in predictions),
+            dtype=np.float64, count=len(predictions)
+        )
+        risk = np.array([p.get('risk_level', '') for p in predictions])
+        high_risk_idx = np.flatnonzero(risk == 'HIGH')
+
         return {
-            'high_risk_students': [p['student_id'] for p in high_risk],
-            'high_risk_count': len(high_risk),
+            'high_risk_students': [predictions[i]['student_id'] for i in high_risk_idx],
+            'high_risk_count': int(high_risk_idx.size),
             'total_students': len(df),
             'key_completion_factors': ['time_spent_min', 'score_percent'],
             'difficult_chapters': [],
-            'average_completion_probability': round(np.mean([p['completion_probability'] for p in predictions]), 3),
+            'average_completion_probability': float(probs.mean().round(3)) if len(predictions) else 0.0,
             'recommendations': 'Focus on high-risk students with personalized intervention'
         }
@@ -7,10 +7,35 @@ import pandas as pd
 import numpy as np
 from typing import Tuple, List
 
+try:
+    import numexpr as ne
+except ImportError:  # pragma: no cover - optional acceleration
+    ne = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - optional acceleration
+    njit = None
+
+# Below this row count numexpr's setup cost outweighs its fused evaluation.
+_NUMEXPR_MIN_ROWS = 2000
+
+# Below this row count the numba kernel's dispatch overhead isn't worth it.
+_NUMBA_MIN_ROWS = 5000
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _engineer_kernel(t, s, out_eng, out_ratio):  # pragma: no cover - compiled
+        for i in prange(len(t)):
+            out_eng[i] = (t[i] / 60.0) * (s[i] / 100.0)
+            out_ratio[i] = t[i] / (s[i] + 1.0)
+else:
+    _engineer_kernel = None
+
 class LearnerDataProcessor:
     """Preprocesses and engineers features from learner data."""
     
-    REQUIRED_COLUMNS = ['student_id', 'course_id', 'time_spent_min', 'score_percent']
+    REQUIRED_COLUMNS = frozenset(('student_id', 'course_id', 'time_spent_min', 'score_percent'))
     
     def __init__(self):
         self.column_mapping = {
@@ -20,34 +45,61 @@ class LearnerDataProcessor:
     
     def validate_input(self, df: pd.DataFrame) -> bool:
         """Validate input data has required columns."""
-        missing = set(self.REQUIRED_COLUMNS) - set(df.columns)
+        missing = self.REQUIRED_COLUMNS.difference(df.columns)
         if missing:
-            raise ValueError(f"Missing columns: {missing}")
-        if df.empty:
+            raise ValueError(f"Missing columns: {set(missing)}")
+        if len(df) == 0:
             raise ValueError("Empty dataframe provided")
         return True
     
     def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create engineered features for modeling."""
-        df = df.copy()
-        
-        # Engagement score: weighted combination of time and performance
-        df['engagement_score'] = (df['time_spent_min'] / 60) * (df['score_percent'] / 100)
-        
-        # Time to score ratio
-        df['time_score_ratio'] = df['time_spent_min'] / (df['score_percent'] + 1)
-        
-        # Performance level
-        df['perf_level'] = pd.cut(df['score_percent'], bins=[0, 40, 70, 100], labels=['low', 'medium', 'high'])
-        
-        # Time engagement level
-        df['time_level'] = pd.cut(df['time_spent_min'], bins=[0, 30, 60, np.inf], labels=['low', 'medium', 'high'])
-        
-        return df
+        """Create engineered features for modeling.
+
+        The input frame is not mutated; all engineered columns are attached
+        in a single assign() rather than a full upfront copy plus
+        column-by-column insertion.
+        """
+        t = df['time_spent_min'].to_numpy()
+        s = df['score_percent'].to_numpy()
+
+        if _engineer_kernel is not None and len(df) >= _NUMBA_MIN_ROWS:
+            # SIMD-vectorized, parallel fused kernel; one pass, no
+            # intermediate allocations beyond the two outputs.
+            engagement = np.empty(len(t), dtype=np.float64)
+            ratio = np.empty(len(t), dtype=np.float64)
+            _engineer_kernel(
+                np.ascontiguousarray(t, dtype=np.float64),
+                np.ascontiguousarray(s, dtype=np.float64),
+                engagement, ratio
+            )
+        elif ne is not None and len(df) >= _NUMEXPR_MIN_ROWS:
+            # Fuse the elementwise arithmetic into single cache-blocked
+            # passes instead of allocating an intermediate per operation.
+            engagement = ne.evaluate('(t / 60.0) * (s / 100.0)')
+            ratio = ne.evaluate('t / (s + 1.0)')
+        else:
+            engagement = (t / 60.0) * (s / 100.0)
+            ratio = t / (s + 1.0)
+
+        # Performance and time engagement levels: searchsorted on small bin
+        # arrays is much cheaper than pd.cut's Categorical construction.
+        level_labels = np.array(['low', 'medium', 'high'])
+
+        return df.assign(
+            # Engagement score: weighted combination of time and performance
+            engagement_score=engagement,
+            # Time to score ratio
+            time_score_ratio=ratio,
+            perf_level=level_labels[np.searchsorted([40, 70], s)],
+            time_level=level_labels[np.searchsorted([30, 60], t)],
+        )
     
     def process(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
         """Process input data and return processed features."""
         self.validate_input(df)
+        # Keep the model features in float32 so the predictor's feature
+        # matrix extraction needs no further dtype conversion.
+        df = df.astype({'time_spent_min': 'float32', 'score_percent': 'float32'}, copy=False)
         df_processed = self.engineer_features(df)
         
         feature_columns = ['time_spent_min', 'score_percent', 'engagement_score', 'time_score_ratio']